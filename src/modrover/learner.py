@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from copy import copy
 from enum import Enum
 from typing import Callable
 
 import numpy as np
+from joblib import Parallel, delayed
 from numpy.typing import NDArray
 from pandas import DataFrame
 from regmod.data import Data
+from regmod.models import GaussianModel, TobitModel
 from regmod.models import Model as RegmodModel
 from regmod.variable import Variable
+from scipy.sparse import issparse
 from scipy.stats import norm
 
 LearnerID = tuple[int, ...]
@@ -40,6 +44,9 @@ class Learner:
         Name corresponding to the weights column in the data frame
     get_score
         Function that evaluate the score of of the model
+    n_folds_jobs
+        Number of threads used to fit the cross validation folds. By default
+        ``n_folds_jobs=1``, folds are fitted sequentially.
 
     """
 
@@ -51,12 +58,14 @@ class Learner:
         param_specs: dict[str, dict],
         weights: str = "weights",
         get_score: Callable | None = None,
+        n_folds_jobs: int = 1,
     ) -> None:
         self.model_class = model_class
         self.obs = obs
         self.main_param = main_param
         self.weights = weights
         self.get_score = get_score
+        self.n_folds_jobs = n_folds_jobs
 
         # convert str to Variable
         for param_spec in param_specs.values():
@@ -70,11 +79,31 @@ class Learner:
         self.score = np.nan
         self.status = ModelStatus.NOT_FITTED
 
-        # initialize cross validation model
-        self._cv_models = defaultdict(self._get_model)
+        # initialize cross validation model, fold models are sliced from the
+        # overall model during fit
+        self._cv_models = {}
         self._cv_scores = defaultdict(lambda: None)
         self._cv_status = defaultdict(lambda: ModelStatus.NOT_FITTED)
 
+    def __copy__(self) -> Learner:
+        """Shallow copy of the learner. The regmod model is copied as well, so
+        that the coefficients of the copy can be set without changing the
+        original learner. The copy keeps the configuration and the
+        coefficients, while score, status and cross validation results are
+        reset to those of a new learner.
+
+        """
+        learner = object.__new__(type(self))
+        learner.__dict__.update(self.__dict__)
+        learner.model = copy(self.model)
+        learner.model.opt_result = None
+        learner.score = np.nan
+        learner.status = ModelStatus.NOT_FITTED
+        learner._cv_models = {}
+        learner._cv_scores = defaultdict(lambda: None)
+        learner._cv_status = defaultdict(lambda: ModelStatus.NOT_FITTED)
+        return learner
+
     @property
     def coef(self) -> NDArray | None:
         """Coefficients in the regmod model."""
@@ -101,6 +130,7 @@ class Learner:
         self,
         data: DataFrame,
         holdouts: list[str] | None = None,
+        holdout_masks: dict[str, NDArray] | None = None,
         **optimizer_options,
     ) -> None:
         """
@@ -125,39 +155,75 @@ class Learner:
             Which column names to iterate over for cross validation. If it is
             `None`, insample performance score will be used to evaluate the
             model.
+        holdout_masks
+            Boolean arrays of the holdout columns, keyed by column name. When
+            the same holdouts are used to fit many learners, the masks can be
+            extracted from the data frame once and passed in. If it is
+            ``None``, the masks are extracted from ``data``.
         **optimizer_options
             Extra options for the optimizer.
 
         """
         if self.status != ModelStatus.NOT_FITTED:
             return
+        # Attach data once, the design matrices are sliced for each fold
+        self.model.attach_df(data)
+        obs = self.model.data.obs
+        mat, offset = None, None
+        if self.get_score is not None:
+            mat, offset = self._get_main_mat()
         if holdouts:
-            # If holdout cols are provided, loop through to calculate OOS score
-            for holdout in holdouts:
-                data_group = data.groupby(holdout)
-                self._cv_status[holdout] = self._fit(
-                    data_group.get_group(0),
-                    self._cv_models[holdout],
-                    **optimizer_options,
+            # If holdout cols are provided, fit all folds to calculate OOS score
+            if holdout_masks is None:
+                holdout_masks = {
+                    holdout: data[holdout].to_numpy(dtype=bool)
+                    for holdout in holdouts
+                }
+            masks = [holdout_masks[holdout] for holdout in holdouts]
+            if self._is_linear_gaussian() and not optimizer_options:
+                results = self._fit_and_score_folds_jointly(
+                    holdouts, masks, obs, mat, offset
                 )
-                if self._cv_status[holdout] == ModelStatus.SUCCESS:
-                    self._cv_scores[holdout] = self.evaluate(
-                        data_group.get_group(1), self._cv_models[holdout]
+            elif self.n_folds_jobs == 1:
+                # stop at the first failed fold, the learner fails anyway
+                results = []
+                for holdout, mask in zip(holdouts, masks):
+                    results.append(
+                        self._fit_and_score_fold(
+                            holdout, mask, obs, mat, offset, **optimizer_options
+                        )
+                    )
+                    if results[-1][1] != ModelStatus.SUCCESS:
+                        break
+            else:
+                results = Parallel(n_jobs=self.n_folds_jobs, prefer="threads")(
+                    delayed(self._fit_and_score_fold)(
+                        holdout, mask, obs, mat, offset, **optimizer_options
                     )
+                    for holdout, mask in zip(holdouts, masks)
+                )
+            total_score = 0.0
+            for holdout, status, score in results:
+                self._cv_status[holdout] = status
+                if status == ModelStatus.SUCCESS:
+                    self._cv_scores[holdout] = score
+                    total_score += score
                 else:
                     self.status = ModelStatus.CV_FAILED
-                    break
             if self.status != ModelStatus.CV_FAILED:
-                self.score = np.mean(list(self._cv_scores.values()))
+                self.score = total_score / len(holdouts)
             # clear all cv models for storage efficiency
             self._cv_models.clear()
 
         # Fit final model with all data included
         if self.status != ModelStatus.CV_FAILED:
-            self.status = self._fit(data, **optimizer_options)
-            # If holdout cols not provided, use in-sample evaluate for the full data model
-            if self.status == ModelStatus.SUCCESS and (not holdouts):
-                self.score = self.evaluate(data)
+            self.status = self._fit(self.model, **optimizer_options)
+        # If holdout cols not provided, use in-sample evaluate for the full data model
+        if self.status == ModelStatus.SUCCESS and (not holdouts):
+            self.score = self._evaluate_rows(
+                np.arange(len(obs)), self.model, obs, mat, offset
+            )
+        self.model = _detach_df(self.model)
 
     def predict(
         self,
@@ -270,25 +336,215 @@ class Learner:
         )
         return model
 
-    def _fit(
+    def _get_fold_model(self, rows: NDArray) -> RegmodModel:
+        """Create the model for the given rows from the overall model, which
+        has the full data attached. Instead of attaching the data frame again,
+        the data frame and the design matrices of the overall model are sliced.
+
+        """
+        model = copy(self.model)
+        model.data = copy(self.model.data)
+        model.data.df = self.model.data.df.iloc[rows]
+        model.mat = [mat[rows] for mat in self.model.mat]
+        if isinstance(model, TobitModel):
+            # tobit model caches the row aligned offset and weights
+            model.offset = [offset[rows] for offset in self.model.offset]
+            model.weights = self.model.weights[rows]
+        return model
+
+    def _fit_and_score_fold(
         self,
-        data: DataFrame,
-        model: RegmodModel | None = None,
+        holdout: str,
+        mask: NDArray,
+        obs: NDArray,
+        mat: NDArray | None,
+        offset: NDArray | None,
         **optimizer_options,
-    ) -> ModelStatus:
-        model = model or self.model
-        model.attach_df(data)
-        mat = model.mat[0]
-        if np.linalg.matrix_rank(mat) < mat.shape[1]:
-            status = ModelStatus.SINGULAR
-        else:
+    ) -> tuple[str, ModelStatus, float | None]:
+        """Fit the model on the training set of one fold and evaluate it on the
+        validation set, where ``mask`` marks the validation rows. The arrays of
+        the full data are passed to :meth:`_evaluate_rows`. Score will be
+        ``None`` if the fit is not successful.
+
+        """
+        score = None
+        model = self._get_fold_model(np.flatnonzero(~mask))
+        self._cv_models[holdout] = model
+        status = self._fit(model, **optimizer_options)
+        if status == ModelStatus.SUCCESS:
+            score = self._evaluate_rows(
+                np.flatnonzero(mask), model, obs, mat, offset
+            )
+        return holdout, status, score
+
+    def _is_linear_gaussian(self) -> bool:
+        """Check if the overall model, with data attached, is a Gaussian model
+        with identity link, dense design matrix and without any constraints.
+        The objective is then quadratic and the optimum solves a linear system.
+
+        """
+        return (
+            isinstance(self.model, GaussianModel)
+            and self.model.params[0].inv_link.name == "identity"
+            and not issparse(self.model.mat[0])
+            and self.model.cmat.size == 0
+        )
+
+    def _fit_and_score_folds_jointly(
+        self,
+        holdouts: list[str],
+        masks: list[NDArray],
+        obs: NDArray,
+        mat: NDArray | None,
+        offset: NDArray | None,
+    ) -> list[tuple[str, ModelStatus, float | None]]:
+        """Fit all folds of a linear Gaussian model at once and evaluate them.
+
+        The objective is quadratic, so the optimum of each fold is a single
+        Newton step from zero. The systems of all folds are stacked and solved
+        with one batched call of :func:`numpy.linalg.solve`, instead of running
+        the optimizer on each fold.
+
+        Unlike :meth:`_fit`, each fold is checked for rank deficiency before
+        the solve on purpose. The batched solve only raises when a system is
+        exactly singular in floating point, and there is no covariance check
+        by regmod to fall back on, so a singular fold would otherwise get
+        meaningless coefficients and a successful status.
+
+        """
+        models = [self._get_fold_model(np.flatnonzero(~mask)) for mask in masks]
+        status = [
+            ModelStatus.SINGULAR
+            if _is_singular(model.mat[0])
+            else ModelStatus.SUCCESS
+            for model in models
+        ]
+        fit_models = [
+            model
+            for model, fit_status in zip(models, status)
+            if fit_status == ModelStatus.SUCCESS
+        ]
+        if fit_models:
+            x0 = np.zeros(self.model.size)
+            hessians = np.stack([model.hessian(x0) for model in fit_models])
+            gradients = np.stack([model.gradient(x0) for model in fit_models])
             try:
-                model.fit(**optimizer_options)
-                status = ModelStatus.SUCCESS
-            except Exception:
-                status = ModelStatus.SOLVER_FAILED
-        model = _detach_df(model)
-        return status
+                coefs = np.linalg.solve(hessians, -gradients[..., np.newaxis])
+            except np.linalg.LinAlgError:
+                # fall back to the optimizer when any of the systems is singular
+                status = [
+                    self._fit(model)
+                    if fit_status == ModelStatus.SUCCESS
+                    else fit_status
+                    for model, fit_status in zip(models, status)
+                ]
+            else:
+                for model, coef in zip(fit_models, coefs):
+                    model.opt_coefs = coef[:, 0]
+
+        results = []
+        for holdout, mask, model, fit_status in zip(
+            holdouts, masks, models, status
+        ):
+            self._cv_models[holdout] = model
+            score = None
+            if fit_status == ModelStatus.SUCCESS:
+                score = self._evaluate_rows(
+                    np.flatnonzero(mask), model, obs, mat, offset
+                )
+            results.append((holdout, fit_status, score))
+        return results
+
+    def _evaluate_rows(
+        self,
+        rows: NDArray,
+        model: RegmodModel,
+        obs: NDArray,
+        mat: NDArray | None,
+        offset: NDArray | None,
+    ) -> float:
+        """Same as :meth:`evaluate`, but on the given rows of the data attached
+        to the overall model, without attaching the data frame to the model.
+        ``obs`` is the observation array of the full data, ``mat`` and
+        ``offset`` are from :meth:`_get_main_mat`, and are only used with
+        ``get_score``. They are extracted once per fit instead of for every
+        evaluation.
+
+        """
+        if self.get_score is None:
+            eval_model = self._get_fold_model(rows)
+            score = np.exp(
+                -eval_model.objective(model.opt_coefs)
+                / eval_model.data.weights.sum()
+            )
+        else:
+            pred = self._predict_from_mat(mat[rows], offset[rows], model)
+            score = self.get_score(obs=obs[rows], pred=pred)
+        return score
+
+    def _get_main_mat(self) -> tuple[NDArray, NDArray]:
+        """Design matrix and offset of the main parameter, from the data
+        attached to the overall model.
+
+        """
+        index = self.model.param_names.index(self.main_param)
+        param = self.model.params[index]
+        mat = self.model.mat[index]
+        if isinstance(self.model, TobitModel):
+            # tobit model stores design matrices in single precision
+            mat = param.get_mat(self.model.data)
+        offset = np.zeros(mat.shape[0])
+        if param.offset is not None:
+            offset = self.model.data.get_cols(param.offset)
+        return mat, offset
+
+    def _predict_from_mat(
+        self, mat: NDArray, offset: NDArray, model: RegmodModel | None = None
+    ) -> NDArray:
+        """Predict the main parameter from its design matrix and offset."""
+        model = model or self.model
+        index = model.param_names.index(self.main_param)
+        coef = model.opt_coefs[model.indices[index]]
+        lin_param = offset + mat.dot(coef)
+        return model.params[index].inv_link.fun(lin_param)
+
+    def _fit(self, model: RegmodModel, **optimizer_options) -> ModelStatus:
+        """Fit the model with data attached.
+
+        The design matrix is checked for rank deficiency before the solver.
+        The singular Hessian check of regmod uses an absolute tolerance, which
+        depends on the scale of the covariates, and the tobit model has none.
+
+        """
+        if _is_singular(model.mat[0]):
+            return ModelStatus.SINGULAR
+        try:
+            model.fit(**optimizer_options)
+        except Exception:
+            return ModelStatus.SOLVER_FAILED
+        return ModelStatus.SUCCESS
+
+
+def _is_singular(mat: NDArray) -> bool:
+    """Check if the design matrix is rank deficient, through the Cholesky
+    decomposition of its gram matrix. The squared pivots are the residual sum
+    of squares of each column regressed on the previous ones, when any of them
+    vanishes relative to the column sum of squares, up to machine precision,
+    the column is linearly dependent.
+
+    """
+    if issparse(mat):
+        gram = mat.T.dot(mat).toarray()
+    else:
+        # tobit model stores design matrices in single precision
+        mat = np.asarray(mat, dtype=float)
+        gram = mat.T.dot(mat)
+    try:
+        pivots = np.diag(np.linalg.cholesky(gram)) ** 2
+    except np.linalg.LinAlgError:
+        return True
+    tol = max(mat.shape) * np.finfo(float).eps
+    return bool((pivots <= tol * np.diag(gram)).any())
 
 
 def _detach_df(model: RegmodModel) -> RegmodModel:
@@ -1,8 +1,9 @@
-from copy import deepcopy
+from copy import copy
 from typing import Callable
 
 import matplotlib.pyplot as plt
 import numpy as np
+from joblib import Parallel, delayed
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from numpy.typing import NDArray
 from pandas import DataFrame
@@ -43,6 +44,13 @@ class Rover:
     get_score
         A callable used to evaluate cross-validated score of sub-learners
         in rover
+    n_jobs
+        Number of processes used to fit the learners within one layer of the
+        exploration. By default ``n_jobs=1``, learners are fitted sequentially.
+        When ``n_jobs=-1``, all the available cores will be used.
+    n_folds_jobs
+        Number of threads used by each learner to fit its cross validation
+        folds. By default ``n_folds_jobs=1``, folds are fitted sequentially.
 
     """
 
@@ -57,6 +65,8 @@ class Rover:
         weights: str = "weights",
         holdouts: list[str] | None = None,
         get_score: Callable = get_rmse,
+        n_jobs: int = 1,
+        n_folds_jobs: int = 1,
     ) -> None:
         self.model_type = self._as_model_type(model_type)
         self.obs = obs
@@ -68,6 +78,8 @@ class Rover:
         self.weights = weights
         self.holdouts = holdouts
         self.get_score = get_score
+        self.n_jobs = n_jobs
+        self.n_folds_jobs = n_folds_jobs
 
         self.learners: dict[LearnerID, Learner] = {}
 
@@ -388,7 +400,15 @@ class Rover:
 
     # construct learner ========================================================
     def _get_param_specs(self, learner_id: LearnerID) -> dict[str, dict]:
-        param_specs = deepcopy(self.param_specs)
+        # only the variables lists are modified downstream, there is no need to
+        # deep copy the rest of the specifications
+        param_specs = {
+            param: {
+                key: list(value) if key == "variables" else value
+                for key, value in param_spec.items()
+            }
+            for param, param_spec in self.param_specs.items()
+        }
         param_specs[self.main_param]["variables"].extend(
             [self.cov_exploring[i] for i in learner_id]
         )
@@ -408,6 +428,7 @@ class Rover:
             param_specs,
             weights=self.weights,
             get_score=self.get_score,
+            n_folds_jobs=self.n_folds_jobs,
         )
 
     # explore ==================================================================
@@ -424,16 +445,37 @@ class Rover:
             for strategy in strategies
         }
 
+        # holdout masks are shared by all learners
+        holdout_masks = {
+            holdout: data[holdout].to_numpy(dtype=bool)
+            for holdout in self.holdouts or []
+        }
+
         for strategy in strategies:
             options = strategy_options[strategy]
             strategy = get_strategy(strategy)(num_covs=len(self.cov_exploring))
             curr_ids = {strategy.base_learner_id}
             while curr_ids:
+                learner_ids = []
                 for learner_id in curr_ids:
-                    learner = self._get_learner(learner_id)
-                    if learner.status == ModelStatus.NOT_FITTED:
-                        learner.fit(data, self.holdouts)
+                    if learner_id in self.learners:
+                        continue
+                    if strategy.should_skip(learner_id, self.learners):
+                        learner = self._get_learner(learner_id)
+                        learner.status = ModelStatus.SINGULAR
                         self.learners[learner_id] = learner
+                    else:
+                        learner_ids.append(learner_id)
+                learners = Parallel(n_jobs=self.n_jobs, backend="loky")(
+                    delayed(_fit_one)(
+                        self._get_learner(learner_id),
+                        data,
+                        self.holdouts,
+                        holdout_masks,
+                    )
+                    for learner_id in learner_ids
+                )
+                self.learners.update(zip(learner_ids, learners))
 
                 next_ids = strategy.get_next_layer(
                     curr_layer=curr_ids,
@@ -457,9 +499,18 @@ class Rover:
         super_coef = coefs.T.dot(weights)
         super_vcov = self._get_super_vcov(learner_ids, weights, super_coef)
 
-        super_learner = self._get_learner(
-            learner_id=self.super_learner_id, use_cache=False
-        )
+        # reuse the model of the explored learner with all covariates when it
+        # is available, the copy is reset to the state of a new learner
+        super_learner = self.learners.get(self.super_learner_id)
+        if (
+            super_learner is not None
+            and super_learner.status == ModelStatus.SUCCESS
+        ):
+            super_learner = copy(super_learner)
+        else:
+            super_learner = self._get_learner(
+                learner_id=self.super_learner_id, use_cache=False
+            )
         super_learner.coef = super_coef
         super_learner.vcov = super_vcov
         self._super_learner = super_learner
@@ -472,19 +523,25 @@ class Rover:
         top_pct_learner: float = 1.0,
         coef_bounds: dict[str, tuple[float, float]] | None = None,
     ) -> DataFrame:
-        df = DataFrame(
-            columns=["learner_id", "status"] + list(self.variables) + ["score"]
+        learner_ids = list(self.learners.keys())
+        status = [learner.status for learner in self.learners.values()]
+        success = np.array(
+            [s == ModelStatus.SUCCESS for s in status], dtype=bool
         )
-        for learner_id, learner in self.learners.items():
-            row = [learner_id, learner.status]
-            coef, score = np.repeat(np.nan, self.num_vars), np.nan
-            if learner.status == ModelStatus.SUCCESS:
-                coef = np.zeros(self.num_vars)
-                coef_index = self._get_coef_index(learner_id)
-                coef[coef_index] = learner.coef
-                score = learner.score
-            row.extend(list(coef) + [score])
-            df.loc[len(df)] = row
+
+        success_ids = [learner_ids[i] for i in np.flatnonzero(success)]
+
+        coef_mat = np.full((len(learner_ids), self.num_vars), np.nan)
+        coef_mat[success] = self._get_coef_mat(success_ids)
+        score = np.full(len(learner_ids), np.nan)
+        score[success] = [
+            self.learners[learner_id].score for learner_id in success_ids
+        ]
+
+        df = DataFrame(coef_mat, columns=list(self.variables))
+        df.insert(0, "learner_id", learner_ids)
+        df.insert(1, "status", status)
+        df["score"] = score
 
         df["coef_valid"] = True
         if coef_bounds:
@@ -514,9 +571,10 @@ class Rover:
         learners.
 
         """
+        head_index, tail_index = self._get_coef_layout()
         super_coef = np.zeros(self.num_vars)
         for learner_id, weight in zip(learner_ids, weights):
-            coef_index = self._get_coef_index(learner_id)
+            coef_index = _build_coef_index(learner_id, head_index, tail_index)
             super_coef[coef_index] += weight * self.learners[learner_id].coef
         return super_coef
 
@@ -526,26 +584,57 @@ class Rover:
         weights: NDArray,
         super_coef: NDArray,
     ) -> NDArray:
+        head_index, tail_index = self._get_coef_layout()
         super_vcov = np.zeros((self.num_vars, self.num_vars))
         for learner_id, weight in zip(learner_ids, weights):
             learner = self.learners[learner_id]
-            coef_index = self._get_coef_index(learner_id)
+            coef_index = _build_coef_index(learner_id, head_index, tail_index)
             super_vcov[np.ix_(coef_index, coef_index)] += weight * (
                 learner.vcov + np.outer(learner.coef, learner.coef)
             )
         super_vcov -= np.outer(super_coef, super_coef)
         return super_vcov
 
+    def _get_coef_mat(self, learner_ids: list[LearnerID]) -> NDArray:
+        """Assemble the coefficients of the given learners into a matrix, with
+        one row per learner and columns aligned with :attr:`variables`.
+        Coefficients of the covariates not in the learner are zero.
+
+        """
+        head_index, tail_index = self._get_coef_layout()
+        coef_mat = np.zeros((len(learner_ids), self.num_vars))
+        if len(learner_ids) == 0:
+            return coef_mat
+        coefs = [self.learners[learner_id].coef for learner_id in learner_ids]
+        row_index = np.repeat(
+            np.arange(len(learner_ids)), [len(coef) for coef in coefs]
+        )
+        col_index = [
+            i
+            for learner_id in learner_ids
+            for i in _build_coef_index(learner_id, head_index, tail_index)
+        ]
+        coef_mat[row_index, col_index] = np.concatenate(coefs)
+        return coef_mat
+
+    def _get_coef_layout(self) -> tuple[list[int], list[int]]:
+        """Position of the variables that are in every learner. Coefficients
+        are laid out as the variables of the parameters up to the main
+        parameter, followed by the exploring covariates and the variables of
+        the rest of the parameters. Returns the positions before and after
+        the exploring covariates.
+
+        """
+        num_covs = [len(self.param_specs[p]["variables"]) for p in self.params]
+        main_index = self.params.index(self.main_param)
+        num_head = sum(num_covs[: main_index + 1])
+        num_tail = sum(num_covs[main_index + 1 :])
+        head_index = list(range(num_head))
+        tail_index = list(range(self.num_vars - num_tail, self.num_vars))
+        return head_index, tail_index
+
     def _get_coef_index(self, learner_id: LearnerID) -> list[int]:
-        coef_index, pointer = [], 0
-        for param in self.params:
-            num_covs = len(self.param_specs[param]["variables"])
-            coef_index.extend(list(range(pointer, pointer + num_covs)))
-            pointer += num_covs
-            if param == self.main_param:
-                coef_index.extend([i + pointer for i in learner_id])
-                pointer += len(self.cov_exploring)
-        return coef_index
+        return _build_coef_index(learner_id, *self._get_coef_layout())
 
     def _get_super_weights(
         self,
@@ -556,14 +645,7 @@ class Rover:
         scores = np.array(
             [self.learners[learner_id].score for learner_id in learner_ids]
         )
-        argsort = np.argsort(scores)[::-1]
-        indices = scores >= scores[argsort[0]] * (1 - top_pct_score)
-        num_learners = int(np.floor(len(scores) * top_pct_learner)) + 1
-        indices[argsort[num_learners:]] = False
-
-        scores[~indices] = 0.0
-        weights = scores / scores.sum()
-        return weights
+        return _compute_super_weights(scores, top_pct_score, top_pct_learner)
 
     # diagnostics ==============================================================
     def _get_summary(self) -> DataFrame:
@@ -628,3 +710,49 @@ class Rover:
         df["significant"] = np.sign(df["coef_lwr"] * df["coef_upr"]) > 0
         self._summary = df
         return df
+
+
+def _build_coef_index(
+    learner_id: LearnerID, head_index: list[int], tail_index: list[int]
+) -> list[int]:
+    """Position of the learner coefficients in the full list of variables,
+    given the layout from :meth:`Rover._get_coef_layout`.
+
+    """
+    num_head = len(head_index)
+    return head_index + [num_head + i for i in learner_id] + tail_index
+
+
+def _compute_super_weights(
+    scores: NDArray, top_pct_score: float, top_pct_learner: float
+) -> NDArray:
+    """Compute the ensemble weights from the learner scores. Only the best
+    ``top_pct_learner`` of the learners with score greater or equal than
+    ``best_score * (1 - top_pct_score)`` get non-zero weights, which are
+    proportional to their scores.
+
+    """
+    num_learners = int(np.floor(len(scores) * top_pct_learner)) + 1
+    num_learners = min(num_learners, len(scores))
+    # only the top learners are needed, partition instead of a full sort
+    top = np.argpartition(scores, -num_learners)[-num_learners:]
+    best_score = scores[top].max()
+    indices = np.zeros(len(scores), dtype=bool)
+    indices[top] = scores[top] >= best_score * (1 - top_pct_score)
+
+    weights = np.where(indices, scores, 0.0)
+    return weights / weights.sum()
+
+
+def _fit_one(
+    learner: Learner,
+    data: DataFrame,
+    holdouts: list[str] | None,
+    holdout_masks: dict[str, NDArray] | None = None,
+) -> Learner:
+    """Fit the learner and return it, so that the fitted learner can be sent
+    back from the worker process.
+
+    """
+    learner.fit(data, holdouts, holdout_masks=holdout_masks)
+    return learner
@@ -63,6 +63,35 @@ class Strategy(ABC):
 
         """
 
+    def should_skip(
+        self,
+        learner_id: LearnerID,
+        learners: dict[LearnerID, Learner],
+    ) -> bool:
+        """Check if the learner can be skipped without being fitted.
+
+        When any of the upstream learners that only contains a subset of the
+        covariates of the current learner is singular, the design matrix of the
+        current learner is singular as well, and there is no need to fit it.
+
+        Parameters
+        ----------
+        learner_id
+            The learner id to check.
+        learners
+            A dictionary contains all fitted learners.
+
+        """
+        for upstream_learner_id in self._get_upstream_learner_ids(
+            learner_id, learners
+        ):
+            if (
+                learners[upstream_learner_id].status == ModelStatus.SINGULAR
+                and set(upstream_learner_id) <= set(learner_id)
+            ):
+                return True
+        return False
+
     def _as_learner_id(self, cov_ids: tuple[int, ...]) -> LearnerID:
         """Validate the provided covariate_id set by the number of total covariates."""
         # Deduplicate cov_ids
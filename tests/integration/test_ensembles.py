@@ -66,6 +66,17 @@ def test_two_parameter_get_coef_index(mock_rover):
     assert np.allclose(coef_index, [0, 1, 2, 4])
 
 
+def test_get_coef_mat(mock_rover):
+    learner_ids = list(mock_rover.learners.keys())
+    coef_mat = mock_rover._get_coef_mat(learner_ids)
+    assert coef_mat.shape == (len(learner_ids), mock_rover.num_vars)
+    for learner_id, coef in zip(learner_ids, coef_mat):
+        expected_coef = np.zeros(mock_rover.num_vars)
+        coef_index = mock_rover._get_coef_index(learner_id)
+        expected_coef[coef_index] = mock_rover.learners[learner_id].coef
+        assert np.allclose(coef, expected_coef)
+
+
 def test_get_super_coef(mock_rover):
     """Check the ensembled coefficients.
 
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from modrover.learner import Learner
+from modrover.learner import Learner, ModelStatus
 from modrover.rover import Rover
 
 
@@ -22,6 +22,19 @@ def test_rover():
     rover.fit(data=dataframe, strategies=["full"], top_pct_score=0.0)
     assert set(rover.learners.keys()) == {tuple(), (0,), (1,), (0, 1)}
     assert isinstance(rover.super_learner, Learner)
+    # super learner is copied from the learner with all covariates
+    full_learner = rover.learners[rover.super_learner_id]
+    assert rover.super_learner is not full_learner
+    assert rover.super_learner.model is not full_learner.model
+    # super learner has the state of a new learner, like when it is built
+    assert rover.super_learner.status == ModelStatus.NOT_FITTED
+    assert np.isnan(rover.super_learner.score)
+    assert rover.super_learner.model.opt_result is None
+    assert len(rover.super_learner._cv_scores) == 0
+    assert len(rover.super_learner._cv_status) == 0
+    assert rover.super_learner._cv_scores is not full_learner._cv_scores
+    assert full_learner.status == ModelStatus.SUCCESS
+    assert len(full_learner._cv_scores) == 1
 
 
 def test_two_parameter_rover():
@@ -48,3 +61,34 @@ def test_two_parameter_rover():
     #   mu - intercept, a, c, d
     #   sigma - intercept, b
     assert rover.super_learner.coef.shape == (6,)
+
+
+def test_rover_parallel():
+    data = np.random.randn(25, 3)
+    columns = ["var_a", "var_b", "y"]
+    dataframe = pd.DataFrame(data, columns=columns)
+    # Fill in intercept and holdout columns
+    dataframe["intercept"] = 1
+    dataframe["holdout"] = np.random.randint(0, 2, 25)
+
+    rover_kwargs = {
+        "model_type": "gaussian",
+        "obs": "y",
+        "cov_fixed": ["intercept"],
+        "cov_exploring": ["var_a", "var_b"],
+        "holdouts": ["holdout"],
+    }
+    rover = Rover(**rover_kwargs)
+    rover.fit(data=dataframe, strategies=["full"], top_pct_score=0.0)
+    parallel_rover = Rover(**rover_kwargs, n_jobs=2)
+    parallel_rover.fit(data=dataframe, strategies=["full"], top_pct_score=0.0)
+
+    assert set(parallel_rover.learners.keys()) == set(rover.learners.keys())
+    for learner_id, learner in rover.learners.items():
+        assert parallel_rover.learners[learner_id].status == learner.status
+        assert np.isclose(
+            parallel_rover.learners[learner_id].score, learner.score
+        )
+    assert np.allclose(
+        parallel_rover.super_learner.coef, rover.super_learner.coef
+    )
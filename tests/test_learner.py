@@ -1,7 +1,9 @@
+from copy import deepcopy
+
 import numpy as np
 import pandas as pd
 import pytest
-from modrover.globals import model_type_dict
+from modrover.globals import get_rmse, model_type_dict
 from modrover.learner import Learner, ModelStatus
 
 
@@ -40,6 +42,17 @@ def test_model_init(model_specs):
     assert np.isnan(learner.score)
 
 
+def test_model_variables_not_shared(model_specs):
+    other_model_specs = deepcopy(model_specs)
+    learner = Learner(**model_specs)
+    other_learner = Learner(**other_model_specs)
+    # priors added to the variables of a learner must not leak to other ones
+    variables = learner.param_specs["mu"]["variables"]
+    other_variables = other_learner.param_specs["mu"]["variables"]
+    for variable, other_variable in zip(variables, other_variables):
+        assert variable is not other_variable
+
+
 def test_model_fit(dataset, model_specs):
     learner = Learner(**model_specs)
 
@@ -52,6 +65,126 @@ def test_model_fit(dataset, model_specs):
     assert isinstance(learner.vcov, np.ndarray)
 
 
+@pytest.mark.parametrize(
+    "variant", ["threaded_folds", "holdout_masks", "optimizer"]
+)
+def test_model_fit_variants(dataset, model_specs, variant):
+    # each variant takes a different path that must give the same fit
+    holdouts = ["holdout_1", "holdout_2"]
+    if variant == "threaded_folds":
+        # folds of linear gaussian models are solved jointly, not in threads
+        dataset["y"] = dataset["y"].abs()
+        model_specs["model_class"] = model_type_dict["poisson"]
+        model_specs["main_param"] = "lam"
+        model_specs["param_specs"] = {"lam": model_specs["param_specs"]["mu"]}
+    variant_model_specs = deepcopy(model_specs)
+    learner = Learner(**model_specs)
+    learner.fit(dataset, holdouts=holdouts)
+
+    n_folds_jobs = 2 if variant == "threaded_folds" else 1
+    variant_learner = Learner(**variant_model_specs, n_folds_jobs=n_folds_jobs)
+    holdout_masks = None
+    if variant == "holdout_masks":
+        holdout_masks = {
+            holdout: dataset[holdout].to_numpy(dtype=bool)
+            for holdout in holdouts
+        }
+    if variant == "optimizer":
+        # force to fit every fold with the optimizer
+        variant_learner._is_linear_gaussian = lambda: False
+    variant_learner.fit(dataset, holdouts=holdouts, holdout_masks=holdout_masks)
+    assert variant_learner.status == learner.status
+    assert np.isclose(variant_learner.score, learner.score)
+    assert np.allclose(variant_learner.coef, learner.coef)
+
+
+@pytest.mark.parametrize("model_type", ["gaussian", "tobit"])
+def test_singular_model_fit(dataset, model_specs, model_type):
+    dataset["y"] = dataset["y"].abs()
+    dataset["var_f"] = 2 * dataset["var_a"]
+    model_specs["model_class"] = model_type_dict[model_type]
+    model_specs["param_specs"]["mu"]["variables"].append("var_f")
+    if model_type == "tobit":
+        model_specs["param_specs"]["sigma"] = {"variables": ["intercept"]}
+    learner = Learner(**model_specs)
+    learner.fit(dataset)
+    assert learner.status == ModelStatus.SINGULAR
+
+
+@pytest.mark.parametrize("model_type", ["gaussian", "poisson"])
+def test_singular_scaled_model_fit(model_type):
+    # regmod does not flag the singular hessian of large scale covariates
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame({"var_a": 1e3 * rng.standard_normal(1000)})
+    dataset["var_f"] = 2 * dataset["var_a"] + 3
+    dataset["intercept"] = 1
+    dataset["y"] = rng.poisson(2.0, size=1000)
+    main_param = "mu" if model_type == "gaussian" else "lam"
+    learner = Learner(
+        model_class=model_type_dict[model_type],
+        obs="y",
+        main_param=main_param,
+        param_specs={
+            main_param: {"variables": ["intercept", "var_a", "var_f"]}
+        },
+    )
+    learner.fit(dataset)
+    assert learner.status == ModelStatus.SINGULAR
+
+
+def test_near_singular_model_fit(dataset, model_specs):
+    # strongly correlated covariates are still full rank, the covariates are
+    # scaled up to clear the absolute singular Hessian check of regmod
+    dataset["var_a"] *= 1e3
+    dataset["var_f"] = dataset["var_a"] + 1e-1 * np.random.randn(25)
+    dataset["holdout_1"] = np.arange(25) % 2
+    dataset["holdout_2"] = 1 - dataset["holdout_1"]
+    model_specs["param_specs"]["mu"]["variables"].append("var_f")
+    learner = Learner(**model_specs, get_score=get_rmse)
+    learner.fit(dataset, holdouts=["holdout_1", "holdout_2"])
+    assert learner.status == ModelStatus.SUCCESS
+    assert np.isfinite(learner.score)
+
+
+def test_singular_fold_fit_jointly(dataset, model_specs):
+    # covariate vanishes on the training rows of the first fold only
+    dataset["holdout_1"] = np.arange(25) % 2
+    dataset["holdout_2"] = 1 - dataset["holdout_1"]
+    dataset["var_f"] = dataset["var_d"] * dataset["holdout_1"]
+    model_specs["param_specs"]["mu"]["variables"].append("var_f")
+    learner = Learner(**model_specs)
+    learner.fit(dataset, holdouts=["holdout_1", "holdout_2"])
+    assert learner._cv_status["holdout_1"] == ModelStatus.SINGULAR
+    assert learner._cv_status["holdout_2"] == ModelStatus.SUCCESS
+    assert learner.status == ModelStatus.CV_FAILED
+
+
+@pytest.mark.parametrize("n_folds_jobs", [1, 2])
+def test_failed_fold_fit(dataset, model_specs, n_folds_jobs):
+    # covariate vanishes on the training rows of the first fold only
+    dataset["y"] = dataset["y"].abs()
+    dataset["holdout_1"] = np.arange(25) % 2
+    dataset["holdout_2"] = 1 - dataset["holdout_1"]
+    dataset["var_f"] = dataset["var_d"] * dataset["holdout_1"]
+    learner = Learner(
+        model_class=model_type_dict["poisson"],
+        obs="y",
+        main_param="lam",
+        param_specs={
+            "lam": {"variables": ["intercept", "var_a", "var_b", "var_f"]}
+        },
+        n_folds_jobs=n_folds_jobs,
+    )
+    learner.fit(dataset, holdouts=["holdout_1", "holdout_2"])
+    assert learner._cv_status["holdout_1"] == ModelStatus.SINGULAR
+    assert learner.status == ModelStatus.CV_FAILED
+    # sequential folds stop at the first failed one
+    expected_status = (
+        ModelStatus.NOT_FITTED if n_folds_jobs == 1 else ModelStatus.SUCCESS
+    )
+    assert learner._cv_status["holdout_2"] == expected_status
+
+
 def test_two_param_model_fit(dataset):
     # Sample two param model: a,b,c are mapped to mu, d,e to sigma
     learner = Learner(
@@ -13,6 +13,7 @@ def test_get_learner():
     learner = rover._get_learner((0, 1, 2))
 
     assert isinstance(learner, Learner)
+    assert learner.n_folds_jobs == 1
     assert len(learner.param_specs["mu"]["variables"]) == 4
     # Check that the order is preserved
     variables = learner.param_specs["mu"]["variables"]
@@ -41,3 +42,33 @@ def test_empty_learner_id():
     variables = learner.param_specs["mu"]["variables"]
     assert len(variables) == 1
     assert variables[0].name == "intercept"
+
+
+def test_get_param_specs_does_not_modify_rover():
+    rover = Rover(
+        model_type="tobit",
+        obs="obs",
+        cov_fixed=["intercept"],
+        cov_exploring=["cov1", "cov2"],
+        main_param="mu",
+        param_specs={"sigma": {"variables": ["intercept"]}},
+    )
+
+    rover._get_learner((0, 1))
+    assert rover.param_specs == {
+        "mu": {"variables": ["intercept"]},
+        "sigma": {"variables": ["intercept"]},
+    }
+
+
+def test_get_learner_n_folds_jobs():
+    rover = Rover(
+        model_type="gaussian",
+        obs="obs",
+        cov_fixed=["intercept"],
+        cov_exploring=["cov1", "cov2"],
+        n_folds_jobs=2,
+    )
+
+    learner = rover._get_learner((0,))
+    assert learner.n_folds_jobs == 2
@@ -208,3 +208,22 @@ def test_learnerid_parents():
     # assert that the base model has no parents
     learner_id = strategy._as_learner_id(())
     assert not any(strategy._get_learner_id_parents(learner_id))
+
+
+def test_should_skip():
+    singular_model = DummyModel()
+    singular_model.status = ModelStatus.SINGULAR
+    learners = {
+        (): DummyModel(),
+        (0,): singular_model,
+        (1,): DummyModel(),
+    }
+
+    # learners contain the covariates of a singular upstream are skipped
+    forward = Forward(3)
+    assert forward.should_skip((0, 1), learners)
+    assert not forward.should_skip((1, 2), learners)
+
+    # upstreams of backward strategy have more covariates, never skipped
+    backward = Backward(3)
+    assert not backward.should_skip((), learners)